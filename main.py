@@ -57,23 +57,45 @@ Devices: VIN, Serial Numbers, IMEI, MAC addresses
 Credentials: API Keys, Passwords, Tokens
 """
 
+import os
+
+# Keep the BLAS/OpenMP pools behind spaCy's matmuls single-threaded. Requests already
+# run concurrently in the threadpool (and across workers), so per-call BLAS threads
+# only oversubscribe the CPUs. Must be set before numpy/thinc are imported; an
+# explicit value in the environment wins.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Tuple
-import os
+import sys
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 from presidio_analyzer import AnalyzerEngine, RecognizerResult
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 import re
 import logging
-from functools import wraps
+from bisect import bisect_left
+from itertools import accumulate
+from functools import lru_cache, wraps
+from operator import attrgetter, itemgetter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sort keys for entity dicts and Presidio RecognizerResults
+_BY_START = itemgetter('start')
+_RESULT_BY_START = attrgetter('start')
+
 # Fallback regex patterns for PII detection (HIPAA, ISO, SOC2 compliance)
 FALLBACK_PATTERNS = {
     # Contact Information
@@ -86,7 +108,7 @@ FALLBACK_PATTERNS = {
     'CREDIT_CARD': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
     'IBAN_CODE': r'\b[A-Z]{2}\d{2}[A-Z0-9]{1,30}\b',
     'ACCOUNT_NUMBER': r'\b(?:account|acct|acc)[\s#:]*\d{6,17}\b',
-    'ROUTING_NUMBER': r'\b\d{9}\b(?=.*(?:routing|aba|rtn))',
+    'ROUTING_NUMBER': r'\b\d{9}\b',  # only with a trailing keyword, see TRAILING_KEYWORDS
     
     # Government IDs (HIPAA)
     'SSN': r'\b\d{3}-\d{2}-\d{4}\b',
@@ -97,7 +119,7 @@ FALLBACK_PATTERNS = {
     'MEDICAL_RECORD_NUMBER': r'\b(?:MRN|medical\s+record|patient\s+id|mrn\s*#|patient\s+number)[\s#:\-]*[A-Z0-9\-]{6,12}\b',  # Medical Record Number (MRN) - handles formats like MRN-882734
     'HEALTH_PLAN_NUMBER': r'\b(?:health plan|insurance|policy)[\s#:]*[A-Z0-9]{6,20}\b',
     'PRESCRIPTION_NUMBER': r'\b(?:rx|prescription)[\s#:]*\d{6,12}\b',
-    'NPI_NUMBER': r'\b\d{10}\b(?=.*npi)',
+    'NPI_NUMBER': r'\b\d{10}\b',  # only with a trailing keyword, see TRAILING_KEYWORDS
     'DEA_NUMBER': r'\b[A-Z]{2}\d{7}\b',
     
     # Date of Birth ONLY - Other dates are preserved (user requirement)
@@ -114,7 +136,7 @@ FALLBACK_PATTERNS = {
     
     # Vehicle & Device Identifiers (HIPAA)
     'VIN': r'\b[A-HJ-NPR-Z0-9]{17}\b',
-    'LICENSE_PLATE': r'\b[A-Z0-9]{2,8}\b(?=.*(?:plate|license plate))',
+    'LICENSE_PLATE': r'\b[A-Z0-9]{2,8}\b',  # only with a trailing keyword, see TRAILING_KEYWORDS
     'DEVICE_ID': r'\b(?:device|serial|imei)[\s#:]*[A-Z0-9]{8,}\b',
     'MAC_ADDRESS': r'\b(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}\b',
     
@@ -216,11 +238,163 @@ FALLBACK_PATTERNS = {
     'SCHOOL_NAME_5': r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\s+(?:Elementary|Middle|Junior|Senior)\s*(?:High)?\s*(?:School)?\b',
 }
 
+# Patterns that only count when one of these keywords follows later on the same line.
+# Equivalent to appending (?=.*(?:keywords)) to the pattern, but that lookahead rescans
+# to the end of the line for every candidate and goes quadratic on long inputs.
+TRAILING_KEYWORDS = {
+    'ROUTING_NUMBER': r'routing|aba|rtn',
+    'NPI_NUMBER': r'npi',
+    'LICENSE_PLATE': r'plate|license plate',
+}
+
+# Lowercase literals (keywords or mandatory separators) at least one of which must occur
+# in the text for the pattern to match at all. Patterns without an entry always run. Keep these in sync with the
+# keyword alternations in FALLBACK_PATTERNS / TRAILING_KEYWORDS.
+PATTERN_KEYWORDS = {
+    'EMAIL_ADDRESS': ('@',),
+    'URL': ('http',),
+    'IP_ADDRESS': ('.',),
+    'SSN': ('-',),
+    'ACCOUNT_NUMBER': ('acc',),
+    'ROUTING_NUMBER': ('routing', 'aba', 'rtn'),
+    'MEDICAL_RECORD_NUMBER': ('mrn', 'medical', 'patient'),
+    'HEALTH_PLAN_NUMBER': ('health plan', 'insurance', 'policy'),
+    'PRESCRIPTION_NUMBER': ('rx', 'prescription'),
+    'NPI_NUMBER': ('npi',),
+    'DATE_OF_BIRTH': ('dob', 'birth', 'born', 'd.o.b'),
+    'AGE_OVER_89': ('age',),
+    'AGE_GENERAL': ('age',),
+    'BIOMETRIC_ID': ('fingerprint', 'retina', 'iris', 'facial', 'biometric'),
+    'GENETIC_MARKER': ('dna', 'genetic', 'genome'),
+    'LICENSE_PLATE': ('plate',),
+    'DEVICE_ID': ('device', 'serial', 'imei'),
+    'MAC_ADDRESS': (':', '-'),
+    'CERTIFICATE_NUMBER': ('cert',),
+    'LICENSE_NUMBER': ('lic',),
+    'API_KEY': ('api', 'access'),
+    'PASSWORD': ('password', 'passwd', 'pwd'),
+    'GENDER_EXPLICIT': ('gender', 'sex'),
+    'USERNAME': ('user', '@', 'handle', 'login', 'uid'),
+    'COMPANY_NAME': ('ltd', 'limited', 'inc', 'corp', 'llc', 'llp', 'l.l.c.', 'private', 'gmbh', 'ag', 'plc', 's.a.'),
+    'ORGANIZATION_NAME': ('foundation', 'association', 'institute', 'university', 'college', 'hospital', 'clinic', 'bank', 'trust'),
+    'INSURANCE_POLICY_NUMBER': ('policy', 'plan'),
+    'INSTITUTION_NAME': ('school', 'college', 'university', 'institute', 'academy'),
+    'US_SSN': ('-',),
+    'HONG_KONG_ID': ('(',),
+    'PAKISTAN_CNIC': ('-',),
+    'THAI_ID': ('-',),
+    'UAE_CIVIL_NUMBER': ('784-',),
+    'APT_UNIT': ('apt', 'apartment', 'unit', 'suite', 'ste', '#'),
+    'CITY_STATE': (',',),
+    'SCHOOL_NAME': ('school', 'academy', 'college', 'institute', 'grammar', 'prep'),
+    'SCHOOL_NAME_2': ('saint',),
+    'SCHOOL_NAME_3': ('school', 'academy', 'college', 'university', 'institute', 'grammar', 'prep'),
+    'SCHOOL_NAME_4': ('school', 'university', 'college', 'institute', 'academy'),
+    'SCHOOL_NAME_5': ('elementary', 'middle', 'junior', 'senior'),
+}
+
+# Patterns that cannot match without at least one decimal digit (\d, [0-9] or a literal
+# digit on every path). Text without digits skips all of them after one scan.
+DIGIT_PATTERNS = frozenset({
+    'PHONE_NUMBER', 'IP_ADDRESS', 'CREDIT_CARD', 'IBAN_CODE', 'ACCOUNT_NUMBER', 'ROUTING_NUMBER',
+    'SSN', 'US_PASSPORT', 'US_DRIVER_LICENSE', 'PRESCRIPTION_NUMBER', 'NPI_NUMBER', 'DEA_NUMBER',
+    'DATE_OF_BIRTH', 'AGE_OVER_89', 'AGE_GENERAL', 'CRYPTO_WALLET', 'AADHAAR_NUMBER', 'PAN_NUMBER',
+    'INDIAN_PASSPORT', 'VEHICLE_REGISTRATION', 'INSURANCE_POLICY_NUMBER', 'US_SSN', 'CANADIAN_SIN',
+    'MEXICAN_CURP', 'BRAZILIAN_CPF', 'ARGENTINIAN_DNI', 'CHILEAN_RUN', 'COLOMBIAN_CEDULA',
+    'VENEZUELAN_ID', 'UK_NINO', 'SPANISH_DNI', 'SPANISH_NIE', 'ITALIAN_CF', 'FINNISH_PIN',
+    'IRELAND_PPSN', 'HONG_KONG_ID', 'TAIWAN_ID', 'SINGAPORE_NRIC', 'PAKISTAN_CNIC', 'THAI_ID',
+    'UAE_CIVIL_NUMBER', 'NEW_ZEALAND_NHI', 'STREET_ADDRESS', 'ZIP_CODE',
+})
+
+_DIGIT_RE = re.compile(r'\d')
+
+# should_anonymize_entity rejects anything shorter than this, so shorter text has no PII
+MIN_PII_LENGTH = 3
+
+# Characters outside ASCII that re.IGNORECASE treats as equal to an ASCII letter.
+# Mapping them before lower() gives a same-length string in which a character equals
+# an ASCII character c exactly when re.IGNORECASE would match it against c.
+_ASCII_CASE_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+def _fold_ascii_case(text: str) -> str:
+    """Lowercase text for substring tests against lowercase ASCII needles (see above)."""
+    return text.translate(_ASCII_CASE_FOLD).lower()
+
+# Entity types matched case-insensitively (substring match on the type name)
+FALLBACK_IGNORECASE_KEYWORDS = ('GENDER', 'DOB', 'MEDICAL', 'HEALTH', 'DEVICE', 'LICENSE', 'CERTIFICATE', 'PASSWORD', 'API')
+SUPPLEMENTARY_IGNORECASE_KEYWORDS = FALLBACK_IGNORECASE_KEYWORDS + ('STREET_ADDRESS', 'APT_UNIT', 'SCHOOL_NAME')
+
+def _compile_patterns(ignorecase_keywords: Tuple[str, ...]) -> list:
+    """
+    Compile FALLBACK_PATTERNS once, in dict order, with per-type case sensitivity.
+    A pattern identical to an earlier one (same regex and flags, i.e. US_SSN/SSN) is
+    dropped: every span it finds was already offered under the earlier type, both
+    types get the same should_anonymize_entity treatment, and both detectors reject
+    a second span at the same position.
+    """
+    compiled = []
+    seen = set()
+    for entity_type, pattern in FALLBACK_PATTERNS.items():
+        flags = re.IGNORECASE if any(keyword in entity_type for keyword in ignorecase_keywords) else 0
+        if (pattern, flags) in seen:
+            continue
+        seen.add((pattern, flags))
+        trailing = TRAILING_KEYWORDS.get(entity_type)
+        # Zero-width search so overlapping keyword occurrences are all reported
+        trailing_re = re.compile(f'(?=(?:{trailing}))', flags) if trailing else None
+        compiled.append((entity_type, re.compile(pattern, flags), trailing_re,
+                         PATTERN_KEYWORDS.get(entity_type), entity_type in DIGIT_PATTERNS))
+    return compiled
+
+def _active_patterns(compiled: list, text: str):
+    """Yield (entity_type, pattern, trailing_re) for patterns whose keywords (and digits) occur in text."""
+    if len(text) < MIN_PII_LENGTH:
+        return
+    folded = _fold_ascii_case(text)
+    has_digit = _DIGIT_RE.search(text) is not None
+    for entity_type, pattern, trailing_re, keywords, needs_digit in compiled:
+        if needs_digit and not has_digit:
+            continue
+        if keywords and not any(keyword in folded for keyword in keywords):
+            continue
+        yield entity_type, pattern, trailing_re
+
+def _finditer_with_trailing_keyword(pattern: re.Pattern, keyword_re: re.Pattern, text: str):
+    """
+    Yield matches of pattern that have a keyword match later on the same line.
+    Keyword and newline positions are collected once; each candidate is a bisect.
+    """
+    keyword_starts = [m.start() for m in keyword_re.finditer(text)]
+    if not keyword_starts:
+        return
+    newlines = [m.start() for m in re.finditer('\n', text)]
+    for match in pattern.finditer(text):
+        end = match.end()
+        i = bisect_left(keyword_starts, end)
+        if i == len(keyword_starts):
+            continue
+        j = bisect_left(newlines, end)
+        line_end = newlines[j] if j < len(newlines) else len(text)
+        if keyword_starts[i] < line_end:
+            yield match
+
+def _iter_pattern_matches(pattern: re.Pattern, trailing_re: Optional[re.Pattern], text: str):
+    """Iterate matches of a compiled fallback pattern, honouring TRAILING_KEYWORDS."""
+    if trailing_re is None:
+        return pattern.finditer(text)
+    return _finditer_with_trailing_keyword(pattern, trailing_re, text)
+
+# Compiled at import time so request handlers never hit the re module cache
+FALLBACK_COMPILED = _compile_patterns(FALLBACK_IGNORECASE_KEYWORDS)
+SUPPLEMENTARY_COMPILED = _compile_patterns(SUPPLEMENTARY_IGNORECASE_KEYWORDS)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Presidio Anonymization API",
     description="High-accuracy PII anonymization with large language model",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson serializes the span lists several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -232,9 +406,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# spaCy pipeline used by the analyzer. en_core_web_lg gives the best NER accuracy;
+# smaller models (e.g. en_core_web_sm) start faster and use far less memory but
+# miss more names/locations. The model must be installed in the image.
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_lg")
+
+# spaCy components switched off after loading. Presidio only reads tokens, lemmas
+# and named entities, so the dependency parser runs for nothing; the tagger and
+# attribute_ruler stay because the lemmatizer depends on them. Comma-separated.
+SPACY_DISABLED_PIPES = [
+    pipe.strip() for pipe in os.environ.get("SPACY_DISABLED_PIPES", "parser").split(",") if pipe.strip()
+]
+
 # Global variables for engines
 analyzer = None
 anonymizer = None
+_engines_initialized = False
+
+# Number of texts spaCy processes per nlp.pipe batch in /anonymize_batch
+BATCH_SIZE = int(os.environ.get("PRESIDIO_BATCH_SIZE", 16))
+
+# LRU cache of ML anonymization and /detect results keyed on (text digest, language,
+# pseudonym), with /detect keys tagged so the two endpoints never collide.
+# Results only depend on these inputs, so repeated documents skip spaCy entirely.
+# Only ML output is stored, and never raw text: /anonymize entries hold anonymized
+# output, /detect entries only (type, start, end, score) tuples.
+# ANONYMIZE_CACHE_SIZE=0 disables the cache.
+CACHE_SIZE = int(os.environ.get("ANONYMIZE_CACHE_SIZE", 2048))
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _cache_key(text: str, language: str, pseudonym: Optional[str]) -> tuple:
+    return (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), language, pseudonym)
+
+def _cache_get(key: tuple):
+    with _result_cache_lock:
+        value = _result_cache.get(key)
+        if value is None:
+            _cache_stats["misses"] += 1
+            return None
+        _result_cache.move_to_end(key)
+        _cache_stats["hits"] += 1
+        return value
+
+def _cache_put(key: tuple, value) -> None:
+    with _result_cache_lock:
+        _result_cache[key] = value
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > CACHE_SIZE:
+            _result_cache.popitem(last=False)
 
 # Request/Response models
 class AnonymizeRequest(BaseModel):
@@ -255,6 +476,8 @@ class DetectRequest(BaseModel):
     pseudonym: Optional[str] = None
     language: str = "en"
 
+# Response models are built with model_construct: their contents come from our own
+# code, and FastAPI validates them against response_model on the way out anyway
 class AnonymizeResponse(BaseModel):
     anonymized_text: str
     anonymized_spans: List[Dict]
@@ -263,26 +486,37 @@ class AnonymizeResponse(BaseModel):
 class DetectResponse(BaseModel):
     entities: List[Dict]
 
+class AnonymizeBatchRequest(BaseModel):
+    texts: List[str]
+    pseudonym: Optional[str] = None
+    pseudonyms: Optional[List[Optional[str]]] = None  # per-text, overrides pseudonym
+    language: str = "en"
+
+class AnonymizeBatchResponse(BaseModel):
+    results: List[AnonymizeResponse]
+
 # Initialize Presidio engines
-@app.on_event("startup")
-async def startup_event():
-    global analyzer, anonymizer
+def initialize_engines(max_retries: int = 3) -> None:
+    """
+    Build the spaCy NLP engine, analyzer (with custom recognizers) and anonymizer.
+    Synchronous so it can run at import time (PRESIDIO_PRELOAD=1) as well as from
+    the startup hook. On repeated failure the service stays in regex fallback mode.
+    """
+    global analyzer, anonymizer, _engines_initialized
     
     logger.info("Starting Presidio initialization...")
     
-    # Use large model for better accuracy
-    # en_core_web_lg provides better NER performance
+    # Large model by default for better accuracy; see SPACY_MODEL
     nlp_config = {
         "nlp_engine_name": "spacy",
         "models": [
             {
                 "lang_code": "en", 
-                "model_name": "en_core_web_lg"  # Large model for better accuracy
+                "model_name": SPACY_MODEL
             }
         ]
     }
     
-    max_retries = 3
     retry_count = 0
     
     while retry_count < max_retries:
@@ -290,6 +524,12 @@ async def startup_event():
             provider = NlpEngineProvider(nlp_configuration=nlp_config)
             nlp_engine = provider.create_engine()
             
+            for nlp in (getattr(nlp_engine, "nlp", None) or {}).values():
+                for pipe in SPACY_DISABLED_PIPES:
+                    if pipe in nlp.pipe_names:
+                        nlp.disable_pipe(pipe)
+                logger.info(f"spaCy pipeline: {nlp.pipe_names}")
+            
             # Create custom recognizers for HIPAA, ISO, SOC2 compliance
             custom_recognizers = create_custom_recognizers()
             
@@ -308,8 +548,9 @@ async def startup_event():
                     logger.warning(f"Failed to add recognizer {recognizer.supported_entities}: {e}")
             
             anonymizer = AnonymizerEngine()
+            _engines_initialized = True
             
-            logger.info(f"✅ Presidio engines initialized with large model and {len(custom_recognizers)} custom recognizers")
+            logger.info(f"✅ Presidio engines initialized with {SPACY_MODEL} and {len(custom_recognizers)} custom recognizers")
             return
             
         except Exception as e:
@@ -324,11 +565,19 @@ async def startup_event():
                 # Don't raise - allow service to start with fallback mode
                 analyzer = None
                 anonymizer = None
+                _engines_initialized = True
                 return
             
             # Wait before retry
-            import asyncio
-            await asyncio.sleep(2 ** retry_count)  # Exponential backoff
+            time.sleep(2 ** retry_count)  # Exponential backoff
+
+@app.on_event("startup")
+async def startup_event():
+    if _engines_initialized:
+        logger.info("Presidio engines already initialized (preloaded)")
+        return
+    # Model loading is blocking; keep it off the event loop
+    await asyncio.to_thread(initialize_engines)
 
 # Replacement function - produces readable [redacted X] placeholders
 # Matches the SPA's getReadableReplacement() logic for consistency
@@ -414,6 +663,31 @@ for _id_type in [
 ]:
     _STATIC_REPLACEMENTS[_id_type] = '[redacted ID]'
 
+# One shared object per distinct label, so spans that carry the same replacement
+# reference the same string and compare by identity first
+_STATIC_REPLACEMENTS = {k: sys.intern(v) for k, v in _STATIC_REPLACEMENTS.items()}
+_DEFAULT_REPLACEMENT = sys.intern('[redacted]')
+
+
+# Types whose replacement depends on the matched text (see get_replacement)
+_PERSON_TYPES = frozenset({'PERSON', 'PER', 'NAME', 'PATIENT_NAME'})
+_ORG_TYPES = frozenset({'ORG', 'ORGANIZATION', 'COMPANY_NAME', 'ORGANIZATION_NAME'})
+_INSTITUTION_TYPES = frozenset({'INSTITUTION_NAME', 'INSTITUTION'})
+_TEXT_DEPENDENT_REPLACEMENT_TYPES = _PERSON_TYPES | _ORG_TYPES | _INSTITUTION_TYPES
+
+# Substrings that make an ORG replacement read "[redacted school]"
+_SCHOOL_ORG_HINTS = ('school', 'university', 'college', 'academy', "'s", 'st ')
+
+@lru_cache(maxsize=512)
+def _static_replacement(entity_type: str) -> Optional[str]:
+    """
+    Replacement for entity types that don't depend on the matched text.
+    Returns None for PERSON/ORG/INSTITUTION/SCHOOL_NAME types handled by get_replacement.
+    """
+    upper = entity_type.upper()
+    if upper in _TEXT_DEPENDENT_REPLACEMENT_TYPES or upper.startswith('SCHOOL_NAME'):
+        return None
+    return _STATIC_REPLACEMENTS.get(upper, _DEFAULT_REPLACEMENT)
 
 def get_replacement(entity_type: str, original_text: str = "") -> str:
     """
@@ -421,21 +695,25 @@ def get_replacement(entity_type: str, original_text: str = "") -> str:
     Matches the SPA's getReadableReplacement() logic for consistency.
     Uses [redacted X] format and first-initial for PERSON.
     """
+    static = _static_replacement(entity_type)
+    if static is not None:
+        return static
+
     upper = entity_type.upper()
 
     # PERSON: first initial (matching SPA's getReadableReplacement)
-    if upper in ('PERSON', 'PER', 'NAME', 'PATIENT_NAME'):
+    if upper in _PERSON_TYPES:
         first = original_text.strip()[:1].upper() if original_text.strip() else ''
         return first if first.isalpha() else '[redacted name]'
 
     # ORG: school detection
-    if upper in ('ORG', 'ORGANIZATION', 'COMPANY_NAME', 'ORGANIZATION_NAME'):
+    if upper in _ORG_TYPES:
         lower = original_text.lower()
-        if any(kw in lower for kw in ['school', 'university', 'college', 'academy', "'s", 'st ']):
+        if any(kw in lower for kw in _SCHOOL_ORG_HINTS):
             return '[redacted school]'
         return '[redacted organization]'
 
-    if upper in ('INSTITUTION_NAME', 'INSTITUTION'):
+    if upper in _INSTITUTION_TYPES:
         return '[redacted institution]'
 
     # School name from supplementary regex patterns
@@ -446,7 +724,7 @@ def get_replacement(entity_type: str, original_text: str = "") -> str:
 
 # Entity types to EXCLUDE from anonymization
 # These are detected by ML but should NOT be anonymized
-EXCLUDED_ENTITY_TYPES = {
+EXCLUDED_ENTITY_TYPES = frozenset({
     # ===== TIME (time-of-day alone is not HIPAA-relevant) =====
     'TIME',           # Time alone - PRESERVE
     
@@ -465,11 +743,87 @@ EXCLUDED_ENTITY_TYPES = {
     'LANGUAGE',       # Languages (spaCy) - PRESERVE (e.g., "English", "Spanish")
     'PRODUCT',        # Products (spaCy) - PRESERVE (e.g., "iPhone", "Windows")
     'FAC',            # Facilities/buildings (spaCy) - PRESERVE (e.g., "Empire State Building")
-}
+})
+
+# Common words that might be detected as PERSON, ORG or LOCATION but are not PII
+COMMON_WORDS_NOT_PII = frozenset({
+    # Role words
+    'patient', 'doctor', 'nurse', 'user', 'client', 'customer', 'admin',
+    'manager', 'director', 'ceo', 'cfo', 'cto', 'president', 'chairman',
+    # Days
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    # Months
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 
+    'august', 'september', 'october', 'november', 'december',
+    # Time words
+    'morning', 'afternoon', 'evening', 'night', 'today', 'tomorrow', 'yesterday',
+    # Common words
+    'ok', 'okay', 'yes', 'no', 'hello', 'hi', 'bye', 'thanks', 'thank',
+    'please', 'sorry', 'help', 'need', 'want', 'like', 'love', 'hate',
+    'good', 'bad', 'great', 'nice', 'best', 'worst', 'first', 'last',
+    'new', 'old', 'big', 'small', 'high', 'low', 'fast', 'slow',
+    'the', 'and', 'but', 'for', 'with', 'this', 'that', 'these', 'those',
+    # Tech/industry words often misdetected as ORG
+    'tech', 'technology', 'technologies', 'software', 'hardware', 'internet',
+    'web', 'mobile', 'app', 'apps', 'digital', 'data', 'cloud', 'ai', 'ml',
+    'seen', 'see', 'saw', 'evolve', 'evolved', 'evolving',
+    # Common verbs that might be misdetected
+    've', 'ive', "i've", 'have', 'has', 'had', 'been', 'being', 'be',
+    # Coaching/therapy domain terms
+    'coaching', 'therapy', 'session', 'practice', 'clinic',
+    'mindfulness', 'wellness', 'wellbeing', 'resilience', 'burnout',
+    'health', 'mental', 'emotional', 'psychological', 'behavioral',
+    'self', 'care', 'growth', 'development', 'leadership',
+    # Medical/clinical abbreviations often misdetected as ORG
+    'dob', 'phi', 'pii', 'hipaa', 'ehr', 'emr', 'icd', 'cpt',
+    'dx', 'rx', 'tx', 'hx', 'sx', 'bmi', 'bp', 'hr',
+    # Government program / ID labels (the label is not PII, the number is)
+    'ssn', 'social', 'security', 'medicare', 'medicaid', 'irs',
+    # Common platforms/tools (not PII — these are tool references, not employer names)
+    'slack', 'zoom', 'teams', 'skype', 'whatsapp', 'signal', 'telegram',
+    'gmail', 'outlook', 'notion', 'asana', 'trello', 'jira', 'confluence',
+    'dropbox', 'drive', 'docs', 'sheets', 'calendar', 'meet',
+    'facetime', 'discord', 'linkedin', 'twitter', 'facebook', 'instagram',
+})
+
+# Overly broad/generic location words that are not identifying
+BROAD_LOCATIONS = frozenset({
+    'earth', 'world', 'global', 'international',
+    'north', 'south', 'east', 'west',
+    'online', 'remote', 'virtual', 'home',
+})
+
+# Per-type rule set used by should_anonymize_entity; types not listed get the default checks
+_TYPE_POLICY = {entity_type: 'exclude' for entity_type in EXCLUDED_ENTITY_TYPES}
+_TYPE_POLICY.update({
+    'DATE_TIME': 'date', 'DATE': 'date',
+    'PERSON': 'name', 'ORG': 'name', 'ORGANIZATION': 'name', 'COMPANY_NAME': 'name',
+    'IP_ADDRESS': 'ip',
+    'LOCATION': 'location', 'GPE': 'location', 'LOC': 'location',
+})
+
+# Version numbers such as 1.2.3 or v2.0
+_VERSION_RE = re.compile(r'^v?\d+(\.\d+)+$', re.IGNORECASE)
+
+# ASCII words checked against COMMON_WORDS_NOT_PII ("&" and other punctuation dropped)
+_WORD_RE = re.compile(r'[a-zA-Z]+')
+
+# Date/age tests shared by should_anonymize_entity and hipaa_date_operator
+_AGE_RE = re.compile(r'^(\d+)[-\s]*year', re.IGNORECASE)
+_MONTH_RE = re.compile(
+    r'\b(?:January|February|March|April|May|June|July|August|'
+    r'September|October|November|December|'
+    r'Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.?\b',
+    re.IGNORECASE
+)
+_YEAR_RE = re.compile(r'\b((?:19|20)\d{2})\b')
+_NUMERIC_DATE_RE = re.compile(r'\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b')
 
 def should_anonymize_entity(entity_type: str, entity_text: str = "", context: str = "") -> bool:
     """
-    Determine if an entity should be anonymized based on its type and context.
+    Determine if an entity should be anonymized based on its type and text.
+    `context` is accepted for API compatibility but not used; callers don't need
+    to slice or lowercase a surrounding window.
     
     Rules:
     1. Excluded entity types are NEVER anonymized (time, numbers, products, etc.)
@@ -477,12 +831,16 @@ def should_anonymize_entity(entity_type: str, entity_text: str = "", context: st
     3. Ages under 89 are preserved; ages 89+ are anonymized (HIPAA Safe Harbor)
     4. Numeric-only entities need context validation to avoid false positives
     5. Common words/phrases that look like PII are filtered out
+    
+    Not memoized: a memo would be keyed on detected entity text and keep raw PII
+    in memory, to save a few set lookups and one regex per entity.
     """
     entity_upper = entity_type.upper()
     entity_text_clean = entity_text.strip()
+    policy = _TYPE_POLICY.get(entity_upper)
     
     # Never anonymize excluded types
-    if entity_upper in EXCLUDED_ENTITY_TYPES:
+    if policy == 'exclude':
         return False
     
     # HIPAA Safe Harbor §164.514(b)(2)(i)(C):
@@ -493,32 +851,25 @@ def should_anonymize_entity(entity_type: str, entity_text: str = "", context: st
     # Strategy: instead of redacting ALL DATE_TIME and carving out exceptions,
     # only redact entities that contain an actual specific date. Everything else
     # (durations, times of day, relative references) passes through.
-    if entity_upper in ('DATE_TIME', 'DATE'):
+    if policy == 'date':
         # Ages under 89: preserve. Ages 89+: anonymize.
-        age_match = re.match(r'^(\d+)[-\s]*year', entity_text_clean, re.IGNORECASE)
+        age_match = _AGE_RE.match(entity_text_clean)
         if age_match:
             age = int(age_match.group(1))
             if age < 89:
-                logger.debug(f"Preserving age under 89: '{entity_text_clean}'")
+                logger.debug("Preserving age under 89: '%s'", entity_text_clean)
                 return False
             else:
-                logger.info(f"Anonymizing age 89+: '{entity_text_clean}'")
+                logger.info("Anonymizing age 89+: '%s'", entity_text_clean)
                 return True
         
         # Only redact if the entity contains a SPECIFIC date indicator:
         # 1. A month name (full or standard abbreviation)
-        has_month = bool(re.search(
-            r'\b(?:January|February|March|April|May|June|July|August|'
-            r'September|October|November|December|'
-            r'Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.?\b',
-            entity_text_clean, re.IGNORECASE
-        ))
+        has_month = bool(_MONTH_RE.search(entity_text_clean))
         # 2. A 4-digit year (1900-2099)
-        has_year = bool(re.search(r'\b(?:19|20)\d{2}\b', entity_text_clean))
+        has_year = bool(_YEAR_RE.search(entity_text_clean))
         # 3. A numeric date format (e.g., 01/15/2024, 2024-01-15)
-        has_numeric_date = bool(re.search(
-            r'\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b', entity_text_clean
-        ))
+        has_numeric_date = bool(_NUMERIC_DATE_RE.search(entity_text_clean))
         
         if has_month or has_year or has_numeric_date:
             return True  # Specific date → redact (year preserved by operator)
@@ -526,7 +877,7 @@ def should_anonymize_entity(entity_type: str, entity_text: str = "", context: st
         # Not a specific date — preserve it.
         # Covers: "in the afternoon", "over six years", "last week",
         # "recently", "the morning", "on Mondays", etc.
-        logger.debug(f"Preserving non-specific date/time: '{entity_text_clean}'")
+        logger.debug("Preserving non-specific date/time: '%s'", entity_text_clean)
         return False
     
     # ===== ADDITIONAL FILTERING TO PREVENT FALSE POSITIVES =====
@@ -537,107 +888,72 @@ def should_anonymize_entity(entity_type: str, entity_text: str = "", context: st
     # "City, CA 94611" patterns. Allowing 2-char LOCATION entities would
     # cause false positives (spaCy tagging random 2-letter sequences as GPE).
     if len(entity_text_clean) < 3:
-        logger.debug(f"Skipping short entity: '{entity_text_clean}'")
+        logger.debug("Skipping short entity: '%s'", entity_text_clean)
         return False
     
+    entity_lower = entity_text_clean.lower()
+    
     # Filter 2: Skip common words that might be detected as PERSON or ORG
-    COMMON_WORDS_NOT_PII = {
-        # Role words
-        'patient', 'doctor', 'nurse', 'user', 'client', 'customer', 'admin',
-        'manager', 'director', 'ceo', 'cfo', 'cto', 'president', 'chairman',
-        # Days
-        'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
-        # Months
-        'january', 'february', 'march', 'april', 'may', 'june', 'july', 
-        'august', 'september', 'october', 'november', 'december',
-        # Time words
-        'morning', 'afternoon', 'evening', 'night', 'today', 'tomorrow', 'yesterday',
-        # Common words
-        'ok', 'okay', 'yes', 'no', 'hello', 'hi', 'bye', 'thanks', 'thank',
-        'please', 'sorry', 'help', 'need', 'want', 'like', 'love', 'hate',
-        'good', 'bad', 'great', 'nice', 'best', 'worst', 'first', 'last',
-        'new', 'old', 'big', 'small', 'high', 'low', 'fast', 'slow',
-        'the', 'and', 'but', 'for', 'with', 'this', 'that', 'these', 'those',
-        # Tech/industry words often misdetected as ORG
-        'tech', 'technology', 'technologies', 'software', 'hardware', 'internet',
-        'web', 'mobile', 'app', 'apps', 'digital', 'data', 'cloud', 'ai', 'ml',
-        'seen', 'see', 'saw', 'evolve', 'evolved', 'evolving',
-        # Common verbs that might be misdetected
-        've', 'ive', "i've", 'have', 'has', 'had', 'been', 'being', 'be',
-        # Coaching/therapy domain terms
-        'coaching', 'therapy', 'session', 'practice', 'clinic',
-        'mindfulness', 'wellness', 'wellbeing', 'resilience', 'burnout',
-        'health', 'mental', 'emotional', 'psychological', 'behavioral',
-        'self', 'care', 'growth', 'development', 'leadership',
-        # Medical/clinical abbreviations often misdetected as ORG
-        'dob', 'phi', 'pii', 'hipaa', 'ehr', 'emr', 'icd', 'cpt',
-        'dx', 'rx', 'tx', 'hx', 'sx', 'bmi', 'bp', 'hr',
-        # Government program / ID labels (the label is not PII, the number is)
-        'ssn', 'social', 'security', 'medicare', 'medicaid', 'irs',
-        # Common platforms/tools (not PII — these are tool references, not employer names)
-        'slack', 'zoom', 'teams', 'skype', 'whatsapp', 'signal', 'telegram',
-        'gmail', 'outlook', 'notion', 'asana', 'trello', 'jira', 'confluence',
-        'dropbox', 'drive', 'docs', 'sheets', 'calendar', 'meet',
-        'facetime', 'discord', 'linkedin', 'twitter', 'facebook', 'instagram',
-    }
     
     # Check for common words - applies to PERSON and ORG entities
-    if entity_upper in ['PERSON', 'ORG', 'ORGANIZATION', 'COMPANY_NAME']:
+    if policy == 'name':
         # Skip ORG entities that look like email addresses (spaCy misclassification).
         # The EmailRecognizer should handle these instead.
         if entity_upper in ('ORG', 'ORGANIZATION') and '@' in entity_text_clean:
-            logger.debug(f"Skipping email-like ORG: '{entity_text_clean}'")
+            logger.debug("Skipping email-like ORG: '%s'", entity_text_clean)
             return False
         
         # Split entity text into words and check each
         # Strip punctuation like "&" for the word check
-        entity_words = re.findall(r'[a-zA-Z]+', entity_text_clean.lower())
-        if entity_words and all(word in COMMON_WORDS_NOT_PII for word in entity_words):
-            logger.debug(f"Skipping common words detected as {entity_upper}: '{entity_text_clean}'")
+        entity_words = _WORD_RE.findall(entity_lower)
+        if entity_words and COMMON_WORDS_NOT_PII.issuperset(entity_words):
+            logger.debug("Skipping common words detected as %s: '%s'", entity_upper, entity_text_clean)
             return False
         
         # Also check if the entire text (lowered) is a common phrase
-        if entity_text_clean.lower() in COMMON_WORDS_NOT_PII:
-            logger.debug(f"Skipping common word detected as {entity_upper}: '{entity_text_clean}'")
+        if entity_lower in COMMON_WORDS_NOT_PII:
+            logger.debug("Skipping common word detected as %s: '%s'", entity_upper, entity_text_clean)
             return False
         
         # Check for phrases like "ve seen tech" - common contractions misdetected
-        if entity_text_clean.lower().startswith(('ve ', "i've ", 'ive ')):
-            logger.debug(f"Skipping contraction phrase detected as {entity_upper}: '{entity_text_clean}'")
+        if entity_lower.startswith(('ve ', "i've ", 'ive ')):
+            logger.debug("Skipping contraction phrase detected as %s: '%s'", entity_upper, entity_text_clean)
             return False
     
     # Filter 3: Always anonymize IP addresses in clinical context (HIPAA #15)
     # Must come BEFORE the version-number filter because IPs like "192.168.42.77"
     # match the version-number regex (digits.digits.digits.digits).
-    if entity_upper == 'IP_ADDRESS':
+    if policy == 'ip':
         return True
     
     # Filter 4: Skip version numbers (e.g., "1.2.3", "v2.0")
-    if re.match(r'^v?\d+(\.\d+)+$', entity_text_clean, re.IGNORECASE):
-        logger.debug(f"Skipping version number: '{entity_text_clean}'")
+    # Cheap first-character test first; most entities can't be a version number
+    first_char = entity_text_clean[0]
+    if (first_char in 'vV' or first_char.isdigit()) and _VERSION_RE.match(entity_text_clean):
+        logger.debug("Skipping version number: '%s'", entity_text_clean)
         return False
     
     # Filter 5: Skip entities that are just numbers without proper context
     # (Phone numbers, SSNs etc. have specific formats that are already validated by regex)
     if entity_text_clean.isdigit() and len(entity_text_clean) < 6:
-        logger.debug(f"Skipping short numeric entity: '{entity_text_clean}'")
+        logger.debug("Skipping short numeric entity: '%s'", entity_text_clean)
         return False
     
     # Filter 6: For LOCATION/GPE, skip overly broad/generic location words
     # but anonymize specific cities, addresses, etc.
-    if entity_upper in ['LOCATION', 'GPE', 'LOC']:
-        lower = entity_text_clean.lower()
-        BROAD_LOCATIONS = {
-            'earth', 'world', 'global', 'international',
-            'north', 'south', 'east', 'west',
-            'online', 'remote', 'virtual', 'home',
-        }
+    if policy == 'location':
+        lower = entity_lower
         if lower in BROAD_LOCATIONS:
-            logger.debug(f"Skipping broad location: '{entity_text_clean}'")
+            logger.debug("Skipping broad location: '%s'", entity_text_clean)
             return False
-        location_words = lower.split()
-        if all(word in COMMON_WORDS_NOT_PII for word in location_words):
-            logger.debug(f"Skipping common-word location: '{entity_text_clean}'")
+        # Single-word locations (the common case) need no split; isprintable()
+        # rules out tabs/newlines/NBSP that str.split() would also break on
+        if ' ' not in lower and lower.isprintable():
+            is_common = lower in COMMON_WORDS_NOT_PII
+        else:
+            is_common = COMMON_WORDS_NOT_PII.issuperset(lower.split())
+        if is_common:
+            logger.debug("Skipping common-word location: '%s'", entity_text_clean)
             return False
     
     # All other entity types - anonymize
@@ -655,12 +971,12 @@ def hipaa_date_operator(entity_text: str) -> str:
     Used as a Presidio custom operator for DATE_TIME / DATE entities.
     """
     # Ages 89+ → "90 or older" (ages < 89 are already filtered in should_anonymize_entity)
-    age_match = re.match(r'^(\d+)[-\s]*year', entity_text, re.IGNORECASE)
+    age_match = _AGE_RE.match(entity_text)
     if age_match and int(age_match.group(1)) >= 89:
         return '90 or older'
     
     # Extract year from date (19xx or 20xx)
-    year_match = re.search(r'\b((?:19|20)\d{2})\b', entity_text)
+    year_match = _YEAR_RE.search(entity_text)
     if year_match:
         return f'<DATE> {year_match.group(1)}'
     
@@ -681,6 +997,9 @@ def person_initial_operator(entity_text: str) -> str:
     return '<PERSON>'
 
 
+_MARKDOWN_TAG_LINK_RE = re.compile(r'\[(<[A-Z_]+>)\]?\(\1\)')
+_TRAILING_TAG_LINES_RE = re.compile(r'(\n<[A-Z_]+>)+\s*$')
+
 def post_process_anonymized_text(text: str) -> str:
     """
     Clean up anonymized text artifacts.
@@ -691,17 +1010,73 @@ def post_process_anonymized_text(text: str) -> str:
        from markdown link cleanup or duplicate URL detection).
     """
     # Clean up markdown link artifacts: [<TAG>](<TAG>) or [<TAG>(<TAG>) → <TAG>
-    text = re.sub(r'\[(<[A-Z_]+>)\]?\(\1\)', r'\1', text)
+    text = _MARKDOWN_TAG_LINK_RE.sub(r'\1', text)
     
     # Remove trailing lines that are just standalone entity tags — these are
     # artifacts from markdown link cleanup or duplicate URL detection, not
     # meaningful content. (A real URL in a sentence is inline, not on its own line.)
-    text = re.sub(r'(\n<[A-Z_]+>)+\s*$', '', text)
+    text = _TRAILING_TAG_LINES_RE.sub('', text)
     
     return text
 
 
-def create_custom_recognizers():
+# ===== CUSTOM RECOGNIZER REGEXES =====
+# Composite patterns used by create_custom_recognizers(), assembled once at import.
+
+# City, State ZIP — e.g. "Oakland, CA", "New York, NY 10001"
+# Requires capitalized city name + uppercase 2-letter state abbreviation
+# City word: "Oakland", "Winston-Salem", "O'Fallon"
+# Single capital allowed only before hyphen/apostrophe (prevents "I, CA")
+_CITY_WORD = r"(?:[A-Z][a-z]+|[A-Z](?=[-']))(?:[-'][A-Z]?[a-z]+)*"
+CITY_STATE_ZIP_REGEX = (
+    r"(?:" + _CITY_WORD + r"(?:\s+" + _CITY_WORD + r")*)"
+    r",\s*(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|"
+    r"ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|"
+    r"RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|DC)"
+    r"(?:\s+\d{5}(?:-\d{4})?)?"
+)
+
+# Street Address
+# Handles: ordinal street names (1st, 2nd, 3rd, 42nd), directional prefixes
+# (N/S/E/W/NE/NW/SE/SW/North/South/East/West), and standard capitalized names.
+_STREET_SUFFIXES = (
+    r'(?:Street|St|Avenue|Ave|Boulevard|Blvd|Drive|Dr|Lane|Ln|Road|Rd|'
+    r'Court|Ct|Place|Pl|Way|Circle|Cir|Terrace|Ter|Trail|Trl|'
+    r'Parkway|Pkwy|Highway|Hwy|Loop|Alley|Aly)'
+)
+STREET_ADDRESS_REGEX = (
+    r'\b\d{1,5}\s+'
+    r'(?:(?:N|S|E|W|NE|NW|SE|SW|North|South|East|West)\.?\s+)?'
+    r'(?:'
+        r'\d{1,3}(?:st|nd|rd|th)'       # ordinal: "3rd", "42nd"
+        r'|'
+        r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*'  # capitalized: "Piedmont", "Martin Luther King"
+    r')\s+'
+    + _STREET_SUFFIXES
+    + r'\.?\b'
+)
+STREET_NO_SUFFIX_REGEX = (
+    r'\b\d{1,5}\s+'
+    r'(?:(?:N|S|E|W|NE|NW|SE|SW|North|South|East|West)\.?\s+)?'
+    r'(?:Broadway|Main|Park|Market|Broad|High|Wall|Canal|Spring)\b'
+)
+
+# Full state name followed by a ZIP — e.g. "California 94611"
+STATE_NAME_ZIP_REGEX = (
+    # Factored by first letter so a capital that starts no state name is rejected
+    # by one branch test instead of fifty
+    r'(?:A(?:labama|laska|rizona|rkansas)|C(?:alifornia|olorado|onnecticut)|'
+    r'Delaware|Florida|Georgia|Hawaii|I(?:daho|llinois|ndiana|owa)|'
+    r'K(?:ansas|entucky)|Louisiana|'
+    r'M(?:aine|aryland|assachusetts|ichigan|innesota|ississippi|issouri|ontana)|'
+    r'N(?:ebraska|evada|ew\s(?:Hampshire|Jersey|Mexico|York)|orth\s(?:Carolina|Dakota))|'
+    r'O(?:hio|klahoma|regon)|Pennsylvania|Rhode\sIsland|South\s(?:Carolina|Dakota)|'
+    r'T(?:ennessee|exas)|Utah|V(?:ermont|irginia)|'
+    r'W(?:ashington|est\sVirginia|isconsin|yoming))\s+\d{5}(?:-\d{4})?'
+)
+
+@lru_cache(maxsize=1)
+def create_custom_recognizers() -> Tuple:
     """
     Create custom recognizers for address detection.
     
@@ -714,6 +1089,9 @@ def create_custom_recognizers():
     re.DOTALL | re.MULTILINE | re.IGNORECASE.  The address patterns
     rely on case distinctions (uppercase state abbreviations vs lowercase
     text) so we explicitly set flags WITHOUT re.IGNORECASE.
+    
+    Built once per process: engine retries and re-initialization reuse the same
+    recognizers, whose patterns Presidio compiles on first use and keeps.
     """
     from presidio_analyzer import PatternRecognizer, Pattern
     
@@ -723,19 +1101,9 @@ def create_custom_recognizers():
     
     try:
         # City, State ZIP — e.g. "Oakland, CA", "New York, NY 10001"
-        # Requires capitalized city name + uppercase 2-letter state abbreviation
-        # City word: "Oakland", "Winston-Salem", "O'Fallon"
-        # Single capital allowed only before hyphen/apostrophe (prevents "I, CA")
-        city_word = r"(?:[A-Z][a-z]+|[A-Z](?=[-']))(?:[-'][A-Z]?[a-z]+)*"
         city_state_zip_pattern = Pattern(
             name="city_state_zip",
-            regex=(
-                r"(?:" + city_word + r"(?:\s+" + city_word + r")*)"
-                r",\s*(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|"
-                r"ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|"
-                r"RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|DC)"
-                r"(?:\s+\d{5}(?:-\d{4})?)?"
-            ),
+            regex=CITY_STATE_ZIP_REGEX,
             score=0.75,
         )
         city_state_zip_recognizer = PatternRecognizer(
@@ -749,36 +1117,15 @@ def create_custom_recognizers():
         
         # Street Address — e.g. "4217 Piedmont Avenue", "123 Oak St", "815 3rd Ave",
         # "789 E Main St", "100 N Broadway"
-        # Handles: ordinal street names (1st, 2nd, 3rd, 42nd), directional prefixes
-        # (N/S/E/W/NE/NW/SE/SW/North/South/East/West), and standard capitalized names.
-        street_suffixes = (
-            r'(?:Street|St|Avenue|Ave|Boulevard|Blvd|Drive|Dr|Lane|Ln|Road|Rd|'
-            r'Court|Ct|Place|Pl|Way|Circle|Cir|Terrace|Ter|Trail|Trl|'
-            r'Parkway|Pkwy|Highway|Hwy|Loop|Alley|Aly)'
-        )
         street_address_pattern = Pattern(
             name="street_address",
-            regex=(
-                r'\b\d{1,5}\s+'
-                r'(?:(?:N|S|E|W|NE|NW|SE|SW|North|South|East|West)\.?\s+)?'
-                r'(?:'
-                    r'\d{1,3}(?:st|nd|rd|th)'       # ordinal: "3rd", "42nd"
-                    r'|'
-                    r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*'  # capitalized: "Piedmont", "Martin Luther King"
-                r')\s+'
-                + street_suffixes
-                + r'\.?\b'
-            ),
+            regex=STREET_ADDRESS_REGEX,
             score=0.7,
         )
         # Also match "Broadway" / other suffix-less street names (common exceptions)
         street_no_suffix_pattern = Pattern(
             name="street_no_suffix",
-            regex=(
-                r'\b\d{1,5}\s+'
-                r'(?:(?:N|S|E|W|NE|NW|SE|SW|North|South|East|West)\.?\s+)?'
-                r'(?:Broadway|Main|Park|Market|Broad|High|Wall|Canal|Spring)\b'
-            ),
+            regex=STREET_NO_SUFFIX_REGEX,
             score=0.65,
         )
         # PO Box — e.g. "P.O. Box 1234", "PO Box 456", "P.O. Box 789"
@@ -912,16 +1259,7 @@ def create_custom_recognizers():
         # Two patterns: (1) "StateName ZIP" for high confidence, (2) bare 5-digit with context.
         zip_state_name_pattern = Pattern(
             name="state_name_zip",
-            regex=(
-                r'(?:Alabama|Alaska|Arizona|Arkansas|California|Colorado|Connecticut|'
-                r'Delaware|Florida|Georgia|Hawaii|Idaho|Illinois|Indiana|Iowa|Kansas|'
-                r'Kentucky|Louisiana|Maine|Maryland|Massachusetts|Michigan|Minnesota|'
-                r'Mississippi|Missouri|Montana|Nebraska|Nevada|New\sHampshire|'
-                r'New\sJersey|New\sMexico|New\sYork|North\sCarolina|North\sDakota|'
-                r'Ohio|Oklahoma|Oregon|Pennsylvania|Rhode\sIsland|South\sCarolina|'
-                r'South\sDakota|Tennessee|Texas|Utah|Vermont|Virginia|Washington|'
-                r'West\sVirginia|Wisconsin|Wyoming)\s+\d{5}(?:-\d{4})?'
-            ),
+            regex=STATE_NAME_ZIP_REGEX,
             score=0.85,
         )
         zip_bare_pattern = Pattern(
@@ -990,7 +1328,13 @@ def create_custom_recognizers():
     except Exception as e:
         logger.error(f"Error creating HIPAA recognizers: {e}")
     
-    return custom_recognizers
+    # Immutable: the caller only iterates it once to register the recognizers
+    return tuple(custom_recognizers)
+
+@lru_cache(maxsize=1024)
+def _compile_pseudonym(pseudonym: str) -> re.Pattern:
+    """Case-insensitive literal pattern for a pseudonym (memoized across requests)."""
+    return re.compile(re.escape(pseudonym), re.IGNORECASE)
 
 def get_protected_ranges(text: str, pseudonym: str) -> List[tuple]:
     """Get text ranges to protect (pseudonym occurrences)."""
@@ -998,11 +1342,31 @@ def get_protected_ranges(text: str, pseudonym: str) -> List[tuple]:
         return []
     
     ranges = []
-    pattern = re.compile(re.escape(pseudonym), re.IGNORECASE)
+    if pseudonym.isascii():
+        # Plain substring search on case-folded copies; same non-overlapping,
+        # left-to-right matches as the case-insensitive regex below
+        folded_text = _fold_ascii_case(text)
+        needle = pseudonym.lower()
+        n = len(needle)
+        i = folded_text.find(needle)
+        while i >= 0:
+            ranges.append((i, i + n))
+            i = folded_text.find(needle, i + n)
+        return ranges
+    
+    pattern = _compile_pseudonym(pseudonym)
     for match in pattern.finditer(text):
         ranges.append((match.start(), match.end()))
     return ranges
 
+def overlaps_protected(protected_ranges: List[tuple], start: int, end: int) -> bool:
+    """
+    True if [start, end) overlaps any protected range. get_protected_ranges returns
+    sorted, non-overlapping ranges, so only the last one starting before `end` can.
+    """
+    i = bisect_left(protected_ranges, (end,))
+    return i > 0 and protected_ranges[i - 1][1] > start
+
 def fallback_pii_detection(text: str, pseudonym: Optional[str] = None) -> List[Dict]:
     """
     Fallback PII detection using regex patterns.
@@ -1012,45 +1376,34 @@ def fallback_pii_detection(text: str, pseudonym: Optional[str] = None) -> List[D
     detected_entities = []
     protected_ranges = get_protected_ranges(text, pseudonym) if pseudonym else []
     
-    # Track overlapping entities to avoid duplicates
-    detected_ranges = []
+    # Track overlapping entities to avoid duplicates: start -> ends detected there
+    detected_ends_by_start = {}
     
-    for entity_type, pattern in FALLBACK_PATTERNS.items():
+    for entity_type, pattern, trailing_re in _active_patterns(FALLBACK_COMPILED, text):
         try:
-            # Use case-insensitive matching for text-based patterns
-            flags = re.IGNORECASE if any(keyword in entity_type for keyword in 
-                ['GENDER', 'DOB', 'MEDICAL', 'HEALTH', 'DEVICE', 'LICENSE', 'CERTIFICATE', 'PASSWORD', 'API']) else 0
-            
-            for match in re.finditer(pattern, text, flags=flags):
+            for match in _iter_pattern_matches(pattern, trailing_re, text):
                 start, end = match.span()
                 
                 # Skip if overlaps with pseudonym
-                overlaps_pseudonym = any(
-                    not (end <= p_start or start >= p_end)
-                    for p_start, p_end in protected_ranges
-                )
-                
-                if overlaps_pseudonym:
+                if protected_ranges and overlaps_protected(protected_ranges, start, end):
                     continue
                 
                 # Skip if significantly overlaps with already detected entity
+                # (both boundaries within 2 chars; only 5 candidate starts to probe)
                 overlaps_existing = any(
-                    abs(start - d_start) < 3 and abs(end - d_end) < 3
-                    for d_start, d_end in detected_ranges
+                    abs(end - d_end) < 3
+                    for d_start in range(start - 2, start + 3)
+                    for d_end in detected_ends_by_start.get(d_start, ())
                 )
                 
                 if overlaps_existing:
                     continue
                 
-                # Get context around the match
-                context_start = max(0, start - 50)
-                context_end = min(len(text), end + 50)
-                context = text[context_start:context_end]
                 matched_text = match.group()
                 
                 # Check if this entity should be anonymized
-                if not should_anonymize_entity(entity_type, matched_text, context):
-                    logger.debug(f"Skipping excluded entity in fallback: {entity_type} = '{matched_text}'")
+                if not should_anonymize_entity(entity_type, matched_text):
+                    logger.debug("Skipping excluded entity in fallback: %s = '%s'", entity_type, matched_text)
                     continue
                 
                 # Adjust confidence based on entity type criticality (HIPAA)
@@ -1069,16 +1422,16 @@ def fallback_pii_detection(text: str, pseudonym: Optional[str] = None) -> List[D
                     'method': 'fallback_regex'
                 })
                 
-                detected_ranges.append((start, end))
+                detected_ends_by_start.setdefault(start, []).append(end)
                 
         except Exception as e:
             logger.error(f"Error in fallback pattern {entity_type}: {e}")
             continue
     
     # Sort by start position for consistent processing
-    detected_entities.sort(key=lambda x: x['start'])
+    detected_entities.sort(key=_BY_START)
     
-    logger.info(f"Fallback detection found {len(detected_entities)} entities across {len(FALLBACK_PATTERNS)} patterns")
+    logger.info("Fallback detection found %d entities across %d patterns", len(detected_entities), len(FALLBACK_PATTERNS))
     
     return detected_entities
 
@@ -1091,46 +1444,31 @@ def supplementary_regex_detection(text: str, pseudonym: Optional[str] = None) ->
     detected_entities = []
     protected_ranges = get_protected_ranges(text, pseudonym) if pseudonym else []
     
-    # Track all detected ranges to avoid overlaps between regex patterns
-    detected_ranges = []
+    # Accepted ranges never overlap, so sorted by start they are also sorted by end;
+    # an overlap check is then a bisect plus one comparison
+    detected_starts = []
+    detected_ends = []
     
-    for entity_type, pattern in FALLBACK_PATTERNS.items():
+    for entity_type, pattern, trailing_re in _active_patterns(SUPPLEMENTARY_COMPILED, text):
         try:
-            # Use case-insensitive matching for text-based patterns
-            flags = re.IGNORECASE if any(keyword in entity_type for keyword in 
-                ['GENDER', 'DOB', 'MEDICAL', 'HEALTH', 'DEVICE', 'LICENSE', 'CERTIFICATE', 'PASSWORD', 'API',
-                 'STREET_ADDRESS', 'APT_UNIT', 'SCHOOL_NAME']) else 0
-            
-            for match in re.finditer(pattern, text, flags=flags):
+            for match in _iter_pattern_matches(pattern, trailing_re, text):
                 start, end = match.span()
                 
                 # Skip if overlaps with pseudonym
-                overlaps_pseudonym = any(
-                    not (end <= p_start or start >= p_end)
-                    for p_start, p_end in protected_ranges
-                )
-                
-                if overlaps_pseudonym:
+                if protected_ranges and overlaps_protected(protected_ranges, start, end):
                     continue
                 
-                # Skip if significantly overlaps with already detected entity
-                overlaps_existing = any(
-                    not (end <= d_start or start >= d_end)
-                    for d_start, d_end in detected_ranges
-                )
-                
-                if overlaps_existing:
+                # Skip if overlaps with already detected entity: the only candidate is
+                # the last accepted range starting before this one ends
+                i = bisect_left(detected_starts, end)
+                if i and detected_ends[i - 1] > start:
                     continue
                 
-                # Get context around the match
-                context_start = max(0, start - 50)
-                context_end = min(len(text), end + 50)
-                context = text[context_start:context_end]
                 matched_text = match.group()
                 
                 # Check if this entity should be anonymized
-                if not should_anonymize_entity(entity_type, matched_text, context):
-                    logger.debug(f"Skipping excluded entity in regex: {entity_type} = '{matched_text}'")
+                if not should_anonymize_entity(entity_type, matched_text):
+                    logger.debug("Skipping excluded entity in regex: %s = '%s'", entity_type, matched_text)
                     continue
                 
                 # Adjust confidence based on entity type criticality (HIPAA)
@@ -1151,14 +1489,16 @@ def supplementary_regex_detection(text: str, pseudonym: Optional[str] = None) ->
                     'method': 'supplementary_regex'
                 })
                 
-                detected_ranges.append((start, end))
+                i = bisect_left(detected_starts, start)
+                detected_starts.insert(i, start)
+                detected_ends.insert(i, end)
                 
         except Exception as e:
             logger.error(f"Error in supplementary regex pattern {entity_type}: {e}")
             continue
     
     # Sort by start position for consistent processing
-    detected_entities.sort(key=lambda x: x['start'])
+    detected_entities.sort(key=_BY_START)
     
     return detected_entities
 
@@ -1172,24 +1512,57 @@ def merge_entities(ml_entities: List[Dict], regex_entities: List[Dict]) -> List[
     """
     merged = list(ml_entities)
     
+    # ML entities may overlap each other: sorted by start with a running max of ends,
+    # "some ML entity starting before r_end ends after r_start" is one bisect
+    ml_sorted = sorted(ml_entities, key=_BY_START)
+    ml_starts = [m['start'] for m in ml_sorted]
+    ml_max_ends = list(accumulate((m['end'] for m in ml_sorted), max))
+    
+    # Accepted regex entities never overlap each other (and are non-empty), so sorted
+    # by start they are also sorted by end; only the last one starting before r_end matters
+    accepted_starts = []
+    accepted_ends = []
+    
     for regex_entity in regex_entities:
         r_start = regex_entity['start']
         r_end = regex_entity['end']
         
         # Check if this regex entity overlaps with any already-accepted entity
-        has_overlap = any(
-            not (r_end <= m['start'] or r_start >= m['end'])
-            for m in merged
-        )
+        i = bisect_left(ml_starts, r_end)
+        if i and ml_max_ends[i - 1] > r_start:
+            continue
+        j = bisect_left(accepted_starts, r_end)
+        if j and accepted_ends[j - 1] > r_start:
+            continue
         
-        if not has_overlap:
-            merged.append(regex_entity)
+        merged.append(regex_entity)
+        j = bisect_left(accepted_starts, r_start)
+        accepted_starts.insert(j, r_start)
+        accepted_ends.insert(j, r_end)
     
     # Sort by start position
-    merged.sort(key=lambda x: x['start'])
+    merged.sort(key=_BY_START)
     return merged
 
 
+# Entity types merge_adjacent_locations treats as parts of one address
+LOCATION_TYPES = frozenset({
+    'LOCATION', 'GPE', 'LOC', 'STREET_ADDRESS', 'CITY_STATE',
+    'STATE_ABBREVIATION', 'APT_UNIT', 'ZIP_CODE', 'ADDRESS',
+})
+
+# Characters allowed in the gap between two location entities that may be merged:
+# what [\s,.\-] matches, i.e. every str.isspace() code point (re's \s) plus ",.-".
+# A gap is separator-only when stripping these leaves nothing.
+_GAP_SEPARATORS = (
+    '\x09\x0a\x0b\x0c\x0d\x1c\x1d\x1e\x1f\x20\x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+    ',.-'
+)
+# ZIP code directly after a location (optionally after a comma/space)
+_TRAILING_ZIP_RE = re.compile(r'[\s,]*(\d{5}(?:-\d{4})?)\b')
+
 def merge_adjacent_locations(entities: List[Dict], text: str) -> List[Dict]:
     """
     Merge adjacent LOCATION-type entities into a single entity.
@@ -1204,10 +1577,6 @@ def merge_adjacent_locations(entities: List[Dict], text: str) -> List[Dict]:
     - Merged result must not exceed 120 characters total
     - After merging, trailing ZIP codes are absorbed if immediately adjacent
     """
-    LOCATION_TYPES = {
-        'LOCATION', 'GPE', 'LOC', 'STREET_ADDRESS', 'CITY_STATE',
-        'STATE_ABBREVIATION', 'APT_UNIT', 'ZIP_CODE', 'ADDRESS',
-    }
     MAX_GAP = 6          # Only merge very close entities (", " = 2 chars, ",  " = 3)
     MAX_MERGED_LEN = 120  # Safety cap on merged span length
     
@@ -1215,23 +1584,28 @@ def merge_adjacent_locations(entities: List[Dict], text: str) -> List[Dict]:
         return entities
     
     # Separate location and non-location entities
-    locations = [e for e in entities if e.get('entity_type', '').upper() in LOCATION_TYPES]
-    non_locations = [e for e in entities if e.get('entity_type', '').upper() not in LOCATION_TYPES]
+    locations = []
+    non_locations = []
+    for e in entities:
+        if e.get('entity_type', '').upper() in LOCATION_TYPES:
+            locations.append(e)
+        else:
+            non_locations.append(e)
     
     if len(locations) <= 1:
         return entities
     
     # Sort locations by start position
-    locations.sort(key=lambda x: x['start'])
+    locations.sort(key=_BY_START)
     
     # Merge adjacent locations
     merged_locations = [locations[0].copy()]
+    grown = set()  # indices into merged_locations whose span was extended
     
     for loc in locations[1:]:
         prev = merged_locations[-1]
         gap_start = prev['end']
         gap_end = loc['start']
-        gap_text = text[gap_start:gap_end]
         new_span_len = loc['end'] - prev['start']
         
         # Merge only if:
@@ -1239,48 +1613,57 @@ def merge_adjacent_locations(entities: List[Dict], text: str) -> List[Dict]:
         # 2. Gap contains ONLY separator chars (no letters, no digits)
         # 3. Merged span doesn't exceed MAX_MERGED_LEN
         is_short_gap = (gap_end - gap_start) <= MAX_GAP
-        is_separator_only = bool(re.match(r'^[\s,.\-]*$', gap_text))
+        gap_text = text[gap_start:gap_end] if is_short_gap else ''
+        is_separator_only = is_short_gap and not gap_text.strip(_GAP_SEPARATORS)
         is_within_size_cap = new_span_len <= MAX_MERGED_LEN
         
         if is_short_gap and is_separator_only and is_within_size_cap:
             prev['end'] = loc['end']
-            prev['text'] = text[prev['start']:prev['end']]
             prev['entity_type'] = 'LOCATION'
             prev['score'] = max(prev.get('score', 0), loc.get('score', 0))
-            logger.debug(f"Merged adjacent locations: '{prev['text']}'")
+            grown.add(len(merged_locations) - 1)
         else:
             merged_locations.append(loc.copy())
             if not is_short_gap:
-                logger.debug(f"Location merge skipped: gap too large ({gap_end - gap_start} > {MAX_GAP})")
+                logger.debug("Location merge skipped: gap too large (%d > %d)", gap_end - gap_start, MAX_GAP)
             elif not is_separator_only:
-                logger.debug(f"Location merge skipped: gap contains non-separator chars: '{gap_text}'")
+                logger.debug("Location merge skipped: gap contains non-separator chars: '%s'", gap_text)
             elif not is_within_size_cap:
-                logger.debug(f"Location merge skipped: merged span too long ({new_span_len} > {MAX_MERGED_LEN})")
+                logger.debug("Location merge skipped: merged span too long (%d > %d)", new_span_len, MAX_MERGED_LEN)
+    
+    # Slice each merged group's text once, rather than after every merge step
+    for i in grown:
+        prev = merged_locations[i]
+        prev['text'] = text[prev['start']:prev['end']]
+        logger.debug("Merged adjacent locations: '%s'", prev['text'])
+    
+    # Non-location spans sorted by start with a running max of ends: "some span starting
+    # before x ends after y" is then a single bisect
+    non_locations_sorted = sorted(non_locations, key=_BY_START)
+    nl_starts = [e['start'] for e in non_locations_sorted]
+    nl_max_ends = list(accumulate((e['end'] for e in non_locations_sorted), max))
     
     # After merging, extend each merged location to absorb a trailing ZIP-like
     # sequence that wasn't independently detected (e.g. " 94611" after "CA")
     for loc in merged_locations:
-        remaining = text[loc['end']:]
-        zip_match = re.match(r'^[\s,]*(\d{5}(?:-\d{4})?)\b', remaining)
+        zip_match = _TRAILING_ZIP_RE.match(text, loc['end'])
         if zip_match:
-            new_end = loc['end'] + zip_match.end()
+            new_end = zip_match.end()
             # Guard: don't extend into another entity's span
-            overlaps_other = any(
-                not (new_end <= e['start'] or loc['end'] >= e['end'])
-                for e in non_locations
-            )
+            i = bisect_left(nl_starts, new_end)
+            overlaps_other = bool(i) and nl_max_ends[i - 1] > loc['end']
             # Guard: don't exceed size cap
             if not overlaps_other and (new_end - loc['start']) <= MAX_MERGED_LEN:
                 loc['end'] = new_end
                 loc['text'] = text[loc['start']:loc['end']]
-                logger.debug(f"Extended location to absorb trailing ZIP: '{loc['text']}'")
+                logger.debug("Extended location to absorb trailing ZIP: '%s'", loc['text'])
     
     result = non_locations + merged_locations
-    result.sort(key=lambda x: x['start'])
+    result.sort(key=_BY_START)
     
     logger.info(
-        f"Location merge: {len(locations)} location entities → {len(merged_locations)} "
-        f"(total entities: {len(result)})"
+        "Location merge: %d location entities → %d (total entities: %d)",
+        len(locations), len(merged_locations), len(result)
     )
     return result
 
@@ -1300,7 +1683,7 @@ def post_process_phone_spans(entities: List[Dict], text: str) -> List[Dict]:
             if start > 0 and text[start - 1] == '(':
                 entity['start'] = start - 1
                 entity['text'] = text[entity['start']:entity['end']]
-                logger.debug(f"Extended phone span to include leading '(': '{entity['text']}'")
+                logger.debug("Extended phone span to include leading '(': '%s'", entity['text'])
     return entities
 
 
@@ -1314,11 +1697,32 @@ def apply_replacements(text: str, entities: List[Dict]) -> Tuple[str, List[Dict]
         return text, []
     
     # Sort entities by start position (reverse order for replacement)
-    sorted_entities = sorted(entities, key=lambda x: x['start'], reverse=True)
+    sorted_entities = sorted(entities, key=_BY_START, reverse=True)
     
-    result_text = text
+    # The text being built is text[:cut] + ''.join(reversed(tail_parts)). Working right
+    # to left, a replacement normally just prepends to the tail instead of copying the
+    # whole string; the result is joined once at the end.
+    cut = len(text)
+    tail_parts = []
     spans = []
     
+    def splice(start: int, end: int, replacement: str) -> None:
+        """Equivalent of result = result[:start] + replacement + result[end:]."""
+        nonlocal cut, tail_parts
+        if 0 <= start <= cut and start <= end:
+            if end <= cut:
+                tail_parts.append(text[end:cut])
+            else:
+                # Overlaps an already replaced entity: cut into the rewritten tail
+                tail = ''.join(reversed(tail_parts))
+                tail_parts = [tail[end - cut:]]
+            tail_parts.append(replacement)
+            cut = start
+        else:
+            current = text[:cut] + ''.join(reversed(tail_parts))
+            tail_parts = [current[:start] + replacement + current[end:]]
+            cut = 0
+    
     for entity in sorted_entities:
         try:
             start = entity['start']
@@ -1337,7 +1741,7 @@ def apply_replacements(text: str, entities: List[Dict]) -> Tuple[str, List[Dict]
                 continue
             
             # Replace in text
-            result_text = result_text[:start] + replacement + result_text[end:]
+            splice(start, end, replacement)
             
             spans.append({
                 'start': start,
@@ -1350,11 +1754,14 @@ def apply_replacements(text: str, entities: List[Dict]) -> Tuple[str, List[Dict]
             logger.error(f"Error replacing entity at {entity.get('start', 'unknown')}: {e}")
             # On error, redact with [redacted] to be safe
             try:
-                result_text = result_text[:start] + "[redacted]" + result_text[end:]
+                splice(start, end, "[redacted]")
             except:
                 pass
             continue
     
+    tail_parts.append(text[:cut])
+    result_text = ''.join(reversed(tail_parts))
+    
     # Reverse spans to have them in document order (start to end)
     spans.reverse()
     
@@ -1367,7 +1774,7 @@ async def root():
     # Determine service mode
     if analyzer and anonymizer:
         mode = "full_ml"
-        model_info = "en_core_web_lg (large)"
+        model_info = SPACY_MODEL
         status_detail = "ML models active, high-accuracy detection"
     elif analyzer or anonymizer:
         mode = "partial_ml"
@@ -1407,6 +1814,7 @@ async def root():
         },
         "endpoints": {
             "POST /anonymize": "Anonymize text (always returns safe content)",
+            "POST /anonymize_batch": "Anonymize a list of texts in one call",
             "POST /detect": "Detect PII/PHI entities (with fallback)",
             "GET /health": "Health check",
             "GET /docs": "Interactive API documentation"
@@ -1424,11 +1832,17 @@ async def health():
         "status": "healthy",
         "ml_analyzer": "active" if analyzer else "fallback_mode",
         "ml_anonymizer": "active" if anonymizer else "fallback_mode",
-        "compliance_mode": "fail_safe_active"
+        "compliance_mode": "fail_safe_active",
+        "cache": {
+            "size": len(_result_cache),
+            "max_size": CACHE_SIZE,
+            "hits": _cache_stats["hits"],
+            "misses": _cache_stats["misses"],
+        },
     }
     
     if analyzer and anonymizer:
-        health_status["model"] = "en_core_web_lg"
+        health_status["model"] = SPACY_MODEL
         health_status["detection_mode"] = "ml_based"
     else:
         health_status["model"] = "regex_fallback"
@@ -1437,8 +1851,178 @@ async def health():
     
     return health_status
 
+@lru_cache(maxsize=8)
+def requested_entities(language: str) -> List[str]:
+    """
+    Entity types to ask the analyzer for: everything it supports for the language
+    except EXCLUDED_ENTITY_TYPES, which should_anonymize_entity would drop anyway.
+    Recognizers that only produce excluded types are then skipped by Presidio.
+    """
+    return [
+        entity for entity in analyzer.get_supported_entities(language=language)
+        if entity.upper() not in EXCLUDED_ENTITY_TYPES
+    ]
+
+# Any letter or digit in any script (\w is str.isalnum() plus underscore)
+_ALNUM_RE = re.compile(r'[^\W_]')
+# Any word character: the regex fallback can match underscores (e.g. USERNAME on
+# "@____"), so only text without a single \w is empty for both detectors
+_WORD_CHAR_RE = re.compile(r'\w')
+
+def anonymize_text(text: str, pseudonym: Optional[str] = None, language: str = "en",
+                   nlp_artifacts=None, cache_checked: bool = False) -> AnonymizeResponse:
+    """
+    Anonymize a single text: ML pipeline when available, regex fallback otherwise.
+    Shared by /anonymize and /anonymize_batch. nlp_artifacts may carry a spaCy
+    result computed ahead of time (batch path); when None, Presidio runs spaCy itself.
+    cache_checked=True means the caller already missed the result cache for this
+    text, so the lookup (and its miss count) is not repeated.
+    Raises only if the fallback path fails as well.
+    """
+    if analyzer and anonymizer:
+        # Text without a single letter or digit carries no PII: skip spaCy entirely
+        if _ALNUM_RE.search(text) is None:
+            return AnonymizeResponse.model_construct(
+                anonymized_text=post_process_anonymized_text(text),
+                anonymized_spans=[],
+                pseudonym_preserved=pseudonym
+            )
+        
+        cache_key = _cache_key(text, language, pseudonym) if CACHE_SIZE > 0 else None
+        if cache_key is not None and not cache_checked:
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            # Build allow_list for pseudonym preservation
+            allow_list = [pseudonym] if pseudonym else []
+            
+            # STEP 1: Detect entities with Presidio
+            results = analyzer.analyze(
+                text=text,
+                language=language,
+                entities=requested_entities(language),
+                score_threshold=0.4,
+                allow_list=allow_list,
+                nlp_artifacts=nlp_artifacts,
+            )
+            
+            # STEP 2: Filter out excluded entity types (dates, numbers, etc.)
+            filtered_results = []
+            for result in results:
+                entity_text = text[result.start:result.end]
+                
+                if should_anonymize_entity(result.entity_type, entity_text):
+                    filtered_results.append(result)
+                    logger.info("  KEEP: %s = '%s' (score=%.2f)", result.entity_type, entity_text, result.score)
+                else:
+                    logger.debug("  SKIP: %s = '%s' (score=%.2f)", result.entity_type, entity_text, result.score)
+            
+            logger.info("Presidio detected %d entities, %d after filtering", len(results), len(filtered_results))
+            
+            # STEP 3: Merge adjacent ORGANIZATION + PERSON entities into PERSON.
+            # spaCy sometimes splits "Franklin Michael Alvarez" into
+            # ORG("Franklin") + PERSON("Michael Alvarez Jr."). Merging before
+            # anonymization ensures the PERSON operator gets the full name and
+            # extracts the correct first initial.
+            filtered_results.sort(key=_RESULT_BY_START)
+            merged_results = []
+            skip_next = False
+            for i, result in enumerate(filtered_results):
+                if skip_next:
+                    skip_next = False
+                    continue
+                if (result.entity_type == 'ORGANIZATION' and
+                        i + 1 < len(filtered_results) and
+                        filtered_results[i + 1].entity_type == 'PERSON'):
+                    gap = text[result.end:filtered_results[i + 1].start]
+                    if gap.strip() == '' and len(gap) <= 3:
+                        merged = RecognizerResult(
+                            entity_type="PERSON",
+                            start=result.start,
+                            end=filtered_results[i + 1].end,
+                            score=max(result.score, filtered_results[i + 1].score),
+                        )
+                        logger.info("  MERGE: ORG+PERSON → PERSON '%s'", text[merged.start:merged.end])
+                        merged_results.append(merged)
+                        skip_next = True
+                        continue
+                merged_results.append(result)
+            
+            # Nothing to replace: AnonymizerEngine would hand the text back unchanged
+            if not merged_results:
+                response = AnonymizeResponse.model_construct(
+                    anonymized_text=post_process_anonymized_text(text),
+                    anonymized_spans=[],
+                    pseudonym_preserved=pseudonym
+                )
+                if cache_key is not None:
+                    _cache_put(cache_key, response)
+                return response
+            
+            # STEP 4: Anonymize with standard Presidio AnonymizerEngine
+            # Custom operators: dates keep year only, names become first initial
+            operators = {
+                "DATE_TIME": OperatorConfig("custom", {"lambda": hipaa_date_operator}),
+                "DATE": OperatorConfig("custom", {"lambda": hipaa_date_operator}),
+                "PERSON": OperatorConfig("custom", {"lambda": person_initial_operator}),
+            }
+            
+            anonymizer_result = anonymizer.anonymize(
+                text=text,
+                analyzer_results=merged_results,
+                operators=operators,
+            )
+            
+            # STEP 5: Post-process to clean up artifacts
+            anonymized_text = post_process_anonymized_text(anonymizer_result.text)
+            
+            # Build spans list from Presidio's result items
+            anonymized_spans = []
+            for item in anonymizer_result.items:
+                anonymized_spans.append({
+                    'start': item.start,
+                    'end': item.end,
+                    'entity_type': item.entity_type,
+                    'replacement': item.text,
+                    'operator': item.operator,
+                })
+            
+            # Reverse to document order (Presidio returns end-to-start)
+            anonymized_spans.reverse()
+            
+            response = AnonymizeResponse.model_construct(
+                anonymized_text=anonymized_text,
+                anonymized_spans=anonymized_spans,
+                pseudonym_preserved=pseudonym
+            )
+            if cache_key is not None:
+                _cache_put(cache_key, response)
+            return response
+            
+        except Exception as e:
+            logger.error(f"ML detection/anonymization failed: {e}, falling back to regex")
+    
+    # FALLBACK: regex-only detection + custom apply_replacements
+    logger.warning("Using fallback regex-based detection")
+    fallback_entities = fallback_pii_detection(text, pseudonym)
+    anonymized_text, anonymized_spans = apply_replacements(
+        text,
+        fallback_entities
+    )
+    
+    return AnonymizeResponse.model_construct(
+        anonymized_text=anonymized_text,
+        anonymized_spans=anonymized_spans,
+        pseudonym_preserved=pseudonym
+    )
+    
+
+# Analysis endpoints are plain `def` so FastAPI runs them in its threadpool:
+# spaCy/Presidio are synchronous and CPU-bound and would otherwise block the event loop.
 @app.post("/anonymize", response_model=AnonymizeResponse)
-async def anonymize(request: AnonymizeRequest):
+def anonymize(request: AnonymizeRequest):
     """
     Anonymize text using standard Presidio pipeline.
     
@@ -1452,129 +2036,82 @@ async def anonymize(request: AnonymizeRequest):
     """
     
     try:
-        if analyzer and anonymizer:
+        return anonymize_text(request.text, request.pseudonym, request.language)
+        
+    except Exception as e:
+        logger.critical(f"Complete anonymization failure: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail="Critical anonymization failure. Please contact support. Original text was NOT returned for security."
+        )
+
+@app.post("/anonymize_batch", response_model=AnonymizeBatchResponse)
+def anonymize_batch(request: AnonymizeBatchRequest):
+    """
+    Anonymize several texts in one call.
+    
+    spaCy processes all texts together through nlp.pipe (PRESIDIO_BATCH_SIZE docs
+    per batch); each text then goes through the same filtering, merging and
+    fallbacks as /anonymize. Results are returned in input order.
+    """
+    pseudonyms = request.pseudonyms if request.pseudonyms is not None else [request.pseudonym] * len(request.texts)
+    if len(pseudonyms) != len(request.texts):
+        raise HTTPException(
+            status_code=422,
+            detail="pseudonyms must have the same length as texts"
+        )
+    
+    try:
+        if not (analyzer and anonymizer):
+            results = [
+                anonymize_text(text, pseudonym, request.language)
+                for text, pseudonym in zip(request.texts, pseudonyms)
+            ]
+            return AnonymizeBatchResponse.model_construct(results=results)
+        
+        # Texts without letters or digits and cached texts are answered without
+        # spaCy; only the rest (by index) go through nlp.pipe
+        results = [None] * len(request.texts)
+        pending = []
+        for i, (text, pseudonym) in enumerate(zip(request.texts, pseudonyms)):
+            if _ALNUM_RE.search(text) is None:
+                results[i] = anonymize_text(text, pseudonym, request.language)
+                continue
+            if CACHE_SIZE > 0:
+                cached = _cache_get(_cache_key(text, request.language, pseudonym))
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+        
+        nlp_artifacts = [None] * len(pending)
+        if pending:
             try:
-                # Build allow_list for pseudonym preservation
-                allow_list = [request.pseudonym] if request.pseudonym else []
-                
-                # STEP 1: Detect entities with Presidio
-                results = analyzer.analyze(
-                    text=request.text,
+                batch = analyzer.nlp_engine.process_batch(
+                    texts=[request.texts[i] for i in pending],
                     language=request.language,
-                    score_threshold=0.4,
-                    allow_list=allow_list,
+                    batch_size=BATCH_SIZE,
                 )
-                
-                # STEP 2: Filter out excluded entity types (dates, numbers, etc.)
-                filtered_results = []
-                for result in results:
-                    entity_text = request.text[result.start:result.end]
-                    
-                    # Get context around the entity
-                    context_start = max(0, result.start - 50)
-                    context_end = min(len(request.text), result.end + 50)
-                    context = request.text[context_start:context_end]
-                    
-                    if should_anonymize_entity(result.entity_type, entity_text, context):
-                        filtered_results.append(result)
-                        logger.info(f"  KEEP: {result.entity_type} = '{entity_text}' (score={result.score:.2f})")
-                    else:
-                        logger.debug(f"  SKIP: {result.entity_type} = '{entity_text}' (score={result.score:.2f})")
-                
-                logger.info(f"Presidio detected {len(results)} entities, {len(filtered_results)} after filtering")
-                
-                # STEP 3: Merge adjacent ORGANIZATION + PERSON entities into PERSON.
-                # spaCy sometimes splits "Franklin Michael Alvarez" into
-                # ORG("Franklin") + PERSON("Michael Alvarez Jr."). Merging before
-                # anonymization ensures the PERSON operator gets the full name and
-                # extracts the correct first initial.
-                filtered_results.sort(key=lambda r: r.start)
-                merged_results = []
-                skip_next = False
-                for i, result in enumerate(filtered_results):
-                    if skip_next:
-                        skip_next = False
-                        continue
-                    if (result.entity_type == 'ORGANIZATION' and
-                            i + 1 < len(filtered_results) and
-                            filtered_results[i + 1].entity_type == 'PERSON'):
-                        gap = request.text[result.end:filtered_results[i + 1].start]
-                        if gap.strip() == '' and len(gap) <= 3:
-                            merged = RecognizerResult(
-                                entity_type="PERSON",
-                                start=result.start,
-                                end=filtered_results[i + 1].end,
-                                score=max(result.score, filtered_results[i + 1].score),
-                            )
-                            logger.info(f"  MERGE: ORG+PERSON → PERSON '{request.text[merged.start:merged.end]}'")
-                            merged_results.append(merged)
-                            skip_next = True
-                            continue
-                    merged_results.append(result)
-                
-                # STEP 4: Anonymize with standard Presidio AnonymizerEngine
-                # Custom operators: dates keep year only, names become first initial
-                operators = {
-                    "DATE_TIME": OperatorConfig("custom", {"lambda": hipaa_date_operator}),
-                    "DATE": OperatorConfig("custom", {"lambda": hipaa_date_operator}),
-                    "PERSON": OperatorConfig("custom", {"lambda": person_initial_operator}),
-                }
-                
-                anonymizer_result = anonymizer.anonymize(
-                    text=request.text,
-                    analyzer_results=merged_results,
-                    operators=operators,
-                )
-                
-                # STEP 5: Post-process to clean up artifacts
-                anonymized_text = post_process_anonymized_text(anonymizer_result.text)
-                
-                # Build spans list from Presidio's result items
-                anonymized_spans = []
-                for item in anonymizer_result.items:
-                    anonymized_spans.append({
-                        'start': item.start,
-                        'end': item.end,
-                        'entity_type': item.entity_type,
-                        'replacement': item.text,
-                        'operator': item.operator,
-                    })
-                
-                # Reverse to document order (Presidio returns end-to-start)
-                anonymized_spans.reverse()
-                
-                return AnonymizeResponse(
-                    anonymized_text=anonymized_text,
-                    anonymized_spans=anonymized_spans,
-                    pseudonym_preserved=request.pseudonym
-                )
-                
+                nlp_artifacts = [artifacts for _, artifacts in batch]
             except Exception as e:
-                logger.error(f"ML detection/anonymization failed: {e}, falling back to regex")
-        
-        # FALLBACK: regex-only detection + custom apply_replacements
-        logger.warning("Using fallback regex-based detection")
-        fallback_entities = fallback_pii_detection(request.text, request.pseudonym)
-        anonymized_text, anonymized_spans = apply_replacements(
-            request.text,
-            fallback_entities
-        )
+                logger.error(f"Batch NLP processing failed: {e}, analyzing texts individually")
+                nlp_artifacts = [None] * len(pending)
         
-        return AnonymizeResponse(
-            anonymized_text=anonymized_text,
-            anonymized_spans=anonymized_spans,
-            pseudonym_preserved=request.pseudonym
-        )
+        for i, artifacts in zip(pending, nlp_artifacts):
+            results[i] = anonymize_text(
+                request.texts[i], pseudonyms[i], request.language, artifacts, cache_checked=True
+            )
+        return AnonymizeBatchResponse.model_construct(results=results)
         
     except Exception as e:
-        logger.critical(f"Complete anonymization failure: {e}")
+        logger.critical(f"Complete batch anonymization failure: {e}")
         raise HTTPException(
             status_code=500, 
             detail="Critical anonymization failure. Please contact support. Original text was NOT returned for security."
         )
 
 @app.post("/detect", response_model=DetectResponse)
-async def detect(request: DetectRequest):
+def detect(request: DetectRequest):
     """
     Detect PII entities without anonymization.
     Features fail-safe mechanisms with fallback detection.
@@ -1583,6 +2120,28 @@ async def detect(request: DetectRequest):
     entities = []
     detection_method = "unknown"
     
+    # Text without a single word character has nothing for either detector to find
+    if _WORD_CHAR_RE.search(request.text) is None:
+        return DetectResponse.model_construct(entities=[])
+    
+    cache_key = None
+    if analyzer and CACHE_SIZE > 0:
+        cache_key = _cache_key(request.text, request.language, request.pseudonym) + ("detect",)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            # Only offsets are cached; the digest key guarantees the same text to slice from
+            return DetectResponse.model_construct(entities=[
+                {
+                    "type": entity_type,
+                    "start": start,
+                    "end": end,
+                    "text": request.text[start:end],
+                    "score": score,
+                    "method": "ml_model"
+                }
+                for entity_type, start, end, score in cached
+            ])
+    
     try:
         # Try ML-based detection first
         if analyzer:
@@ -1590,25 +2149,22 @@ async def detect(request: DetectRequest):
                 results = analyzer.analyze(
                     text=request.text,
                     language=request.language,
+                    entities=requested_entities(request.language),
                     score_threshold=0.4
                 )
 
                 # Filter and format results
+                pseudonym_lower = request.pseudonym.lower() if request.pseudonym else None
                 for result in results:
                     try:
                         entity_text = request.text[result.start:result.end]
                         
                         # Skip if contains pseudonym
-                        if request.pseudonym and request.pseudonym.lower() in entity_text.lower():
+                        if pseudonym_lower and pseudonym_lower in entity_text.lower():
                             continue
                         
-                        # Get context around the entity
-                        context_start = max(0, result.start - 50)
-                        context_end = min(len(request.text), result.end + 50)
-                        context = request.text[context_start:context_end]
-                        
                         # Check if this entity should be anonymized (skip excluded types)
-                        if not should_anonymize_entity(result.entity_type, entity_text, context):
+                        if not should_anonymize_entity(result.entity_type, entity_text):
                             continue
                         
                         entities.append({
@@ -1624,7 +2180,7 @@ async def detect(request: DetectRequest):
                         continue
                 
                 detection_method = "ml_model"
-                logger.info(f"ML-based detection found {len(entities)} entities")
+                logger.info("ML-based detection found %d entities", len(entities))
                 
             except Exception as e:
                 logger.error(f"ML-based detection failed: {e}, using fallback")
@@ -1649,8 +2205,12 @@ async def detect(request: DetectRequest):
             
             detection_method = "fallback_regex"
         
-        logger.info(f"Detection completed with {detection_method}, found {len(entities)} entities")
-        return DetectResponse(entities=entities)
+        logger.info("Detection completed with %s, found %d entities", detection_method, len(entities))
+        if cache_key is not None and detection_method == "ml_model":
+            _cache_put(cache_key, tuple(
+                (entity["type"], entity["start"], entity["end"], entity["score"]) for entity in entities
+            ))
+        return DetectResponse.model_construct(entities=entities)
         
     except Exception as e:
         logger.error(f"Complete detection failure: {e}")
@@ -1671,15 +2231,28 @@ async def detect(request: DetectRequest):
                 })
             
             logger.warning("Emergency fallback detection successful")
-            return DetectResponse(entities=entities)
+            return DetectResponse.model_construct(entities=entities)
             
         except Exception as critical_error:
             logger.critical(f"Emergency fallback detection failed: {critical_error}")
             # Return empty list rather than failing completely
             # This ensures the service remains available
-            return DetectResponse(entities=[])
+            return DetectResponse.model_construct(entities=[])
+
+# Load models at import time when requested, e.g. under `gunicorn --preload` so
+# forked workers share the model pages copy-on-write instead of each loading a copy
+if os.environ.get("PRESIDIO_PRELOAD", "0") == "1":
+    initialize_engines()
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Each worker process loads its own copy of the spaCy model
+    workers = int(os.environ.get("WORKERS", 1))
+    if workers > 1:
+        # Multiple workers need an import string; each worker process imports main
+        uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers)
+    else:
+        # Pass the app object: an import string would import this file a second
+        # time as `main` and, with PRESIDIO_PRELOAD=1, load the engines twice
+        uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
@@ -16,6 +16,9 @@ import json
 # API endpoint (update when deployed)
 API_URL = "http://localhost:8080"
 
+# One keep-alive connection for the whole run instead of a new one per request
+session = requests.Session()
+
 # Test cases covering HIPAA, ISO, SOC2 requirements
 test_cases = [
     {
@@ -270,7 +273,7 @@ def test_detect_endpoint():
             payload["pseudonym"] = test_case["pseudonym"]
         
         try:
-            response = requests.post(f"{API_URL}/detect", json=payload)
+            response = session.post(f"{API_URL}/detect", json=payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -312,7 +315,7 @@ def test_anonymize_endpoint():
             payload["pseudonym"] = test_case["pseudonym"]
         
         try:
-            response = requests.post(f"{API_URL}/anonymize", json=payload)
+            response = session.post(f"{API_URL}/anonymize", json=payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -406,7 +409,7 @@ def test_health_endpoint():
     print("="*80)
     
     try:
-        response = requests.get(f"{API_URL}/health")
+        response = session.get(f"{API_URL}/health")
         
         if response.status_code == 200:
             result = response.json()
@@ -425,7 +428,7 @@ def test_root_endpoint():
     print("="*80)
     
     try:
-        response = requests.get(f"{API_URL}/")
+        response = session.get(f"{API_URL}/")
         
         if response.status_code == 200:
             result = response.json()
@@ -6,6 +6,10 @@ Tests the enhanced compliance features
 
 import json
 import requests
+from collections import defaultdict
+
+# One keep-alive connection pool for the whole run instead of a new connection per request
+session = requests.Session()
 
 # Test data
 TEST_DATA = {
@@ -38,17 +42,15 @@ def test_detect():
     print("="*80)
     
     try:
-        response = requests.post("http://localhost:8080/detect", json=TEST_DATA)
+        response = session.post("http://localhost:8080/detect", json=TEST_DATA)
         result = response.json()
         
         print(f"Status Code: {response.status_code}")
         print(f"\nDetected {len(result['entities'])} entities:")
         
-        detected_types = {}
+        detected_types = defaultdict(list)
         for entity in result['entities']:
             entity_type = entity['type']
-            if entity_type not in detected_types:
-                detected_types[entity_type] = []
             detected_types[entity_type].append({
                 'text': entity['text'],
                 'score': entity['score'],
@@ -73,7 +75,7 @@ def test_anonymize():
     print("="*80)
     
     try:
-        response = requests.post("http://localhost:8080/anonymize", json=TEST_DATA)
+        response = session.post("http://localhost:8080/anonymize", json=TEST_DATA)
         result = response.json()
         
         print(f"Status Code: {response.status_code}")
@@ -110,7 +112,7 @@ def test_health():
     print("="*80)
     
     try:
-        response = requests.get("http://localhost:8080/health")
+        response = session.get("http://localhost:8080/health")
         result = response.json()
         
         print(f"Status Code: {response.status_code}")
@@ -150,6 +152,9 @@ def main():
     
     if detect_result and anon_result:
         detected_entities = detect_result['entities']
+        # All detected texts in one newline-joined string: none of the expected
+        # values contain a newline, so a single `in` per value covers every entity
+        detected_text = "\n".join(entity['text'].strip() for entity in detected_entities)
         
         print("\nExpected PII Types to Detect:")
         for pii_name, pii_value in EXPECTED_DETECTIONS.items():
@@ -163,13 +168,7 @@ def main():
             ("Passport", "ZX4589217"),
         ]
         
-        found_critical = {name: False for name, _ in critical_pii}
-        
-        for entity in detected_entities:
-            text = entity['text'].strip()
-            for name, expected_value in critical_pii:
-                if expected_value in text:
-                    found_critical[name] = True
+        found_critical = {name: expected_value in detected_text for name, expected_value in critical_pii}
         
         for name, found in found_critical.items():
             status = "✅" if found else "❌"
@@ -185,13 +184,7 @@ def main():
             ("Username", "rahulmehta91"),
         ]
         
-        found_org = {name: False for name, _ in org_data}
-        
-        for entity in detected_entities:
-            text = entity['text'].strip()
-            for name, search_term in org_data:
-                if search_term in text:
-                    found_org[name] = True
+        found_org = {name: search_term in detected_text for name, search_term in org_data}
         
         for name, found in found_org.items():
             status = "✅" if found else "❌"